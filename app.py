@@ -1,63 +1,148 @@
-from flask import Flask, request, jsonify, session, render_template
+from flask import Flask, request, jsonify, session, Response, g
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
+from flask_compress import Compress
 from flask_sqlalchemy import SQLAlchemy
 from models.lightweight_ai import LightweightAI
-from models.user import db, User
+from models.user import db, User, check_dummy_password
 import os
 import urllib.parse
-from datetime import datetime, timedelta
-from sqlalchemy import text
+import hashlib
+import time
+from datetime import datetime
+from sqlalchemy import text, select, func, case, bindparam, inspect
+import orjson
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Parse request bodies and encode jsonify() responses with orjson"""
+    option = orjson.OPT_SORT_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default, option=self.option).decode()
+    
+    def response(self, *args, **kwargs):
+        # orjson's bytes go straight into the response body, skipping the
+        # str round-trip that DefaultJSONProvider.response makes through dumps()
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=self.default, option=self.option | orjson.OPT_APPEND_NEWLINE)
+        return self._app.response_class(body, mimetype=self.mimetype)
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
 
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'dev-secret-key')
 # Use Railway Postgres if available, fallback to SQLite for local dev
-
-import os
-print("RAW DATABASE_URL:", repr(os.environ.get('DATABASE_URL')))
 db_url = os.environ.get('DATABASE_URL', 'sqlite:///users.db')
 if db_url and db_url.startswith('postgres://'):
     db_url = db_url.replace('postgres://', 'postgresql://', 1)
 app.config['SQLALCHEMY_DATABASE_URI'] = db_url
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-CORS(app, origins=["*"])
+# Comma-separated list of allowed origins, e.g. "https://app.example.com"
+cors_origins = [o.strip() for o in os.environ.get('CORS_ORIGINS', '*').split(',') if o.strip()]
+# Browsers may reuse a preflight result for a day instead of repeating the
+# OPTIONS request before every POST
+CORS(app, origins=cors_origins, max_age=86400)
+app.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+app.config['COMPRESS_MIN_SIZE'] = 512
+Compress(app)
 db.init_app(app)
 ai = LightweightAI()
 
+def ensure_is_admin_column():
+    """Add the is_admin column to users tables created before it existed"""
+    column_names = [col['name'] for col in inspect(db.engine).get_columns('users')]
+    if 'is_admin' in column_names:
+        return
+    print("Adding is_admin column to users table...")
+    try:
+        db.session.execute(text('ALTER TABLE users ADD COLUMN is_admin BOOLEAN DEFAULT FALSE'))
+        db.session.commit()
+        print("Successfully added is_admin column!")
+    except Exception as e:
+        db.session.rollback()
+        print(f"Error adding is_admin column: {e}")
+        # Try alternative syntax for PostgreSQL
+        try:
+            db.session.execute(text('ALTER TABLE "users" ADD COLUMN is_admin BOOLEAN DEFAULT FALSE'))
+            db.session.commit()
+            print("Successfully added is_admin column with quotes!")
+        except Exception as e2:
+            db.session.rollback()
+            print(f"Error with quoted table name: {e2}")
+
 with app.app_context():
     db.create_all()
-    print("Tables created! Using database:", app.config['SQLALCHEMY_DATABASE_URI'])
+    ensure_is_admin_column()
+    # Drop the pooled connection so workers forked after a gunicorn
+    # --preload import don't share the master's socket
+    db.engine.dispose()
+
+@app.cli.command('init-db')
+def init_db():
+    """Create tables and print the users table schema"""
+    db.create_all()
+    ensure_is_admin_column()
+    print("Tables created! Using database:", db.engine.url.render_as_string(hide_password=True))
     # Print user table schema for confirmation
-    from sqlalchemy import inspect
-    inspector = inspect(db.engine)
-    columns = inspector.get_columns('users')
+    columns = inspect(db.engine).get_columns('users')
     print("User table columns:")
     for col in columns:
         print(f"  {col['name']}: {col['type']}")
-    
-    # Check if is_admin column exists, if not add it
-    column_names = [col['name'] for col in columns]
-    if 'is_admin' not in column_names:
-        print("Adding is_admin column to users table...")
-        try:
-            db.session.execute(text('ALTER TABLE users ADD COLUMN is_admin BOOLEAN DEFAULT FALSE'))
-            db.session.commit()
-            print("Successfully added is_admin column!")
-        except Exception as e:
-            print(f"Error adding is_admin column: {e}")
-            # Try alternative syntax for PostgreSQL
-            try:
-                db.session.execute(text('ALTER TABLE "users" ADD COLUMN is_admin BOOLEAN DEFAULT FALSE'))
-                db.session.commit()
-                print("Successfully added is_admin column with quotes!")
-            except Exception as e2:
-                print(f"Error with quoted table name: {e2}")
 
-import os
-print("ENV VARS:", dict(os.environ))
+# (second, ISO string) of the last timestamp handed out by now_iso()
+_timestamp_cache = [None, '']
+
+def now_iso():
+    """Current local time in ISO format, formatted at most once per second"""
+    second = int(time.time())
+    if second != _timestamp_cache[0]:
+        _timestamp_cache[:] = [second, datetime.fromtimestamp(second).isoformat()]
+    return _timestamp_cache[1]
+
+# key -> (expiry, payload) for admin endpoints polled by the dashboard
+_admin_cache = {}
+
+def cached_admin_payload(key, ttl, compute):
+    """Return compute()'s payload, reusing it for up to ttl seconds"""
+    now = time.monotonic()
+    entry = _admin_cache.get(key)
+    if entry is None or entry[0] <= now:
+        entry = (now + ttl, compute())
+        _admin_cache[key] = entry
+    return entry[1]
+
+def load_page(name):
+    """Read a static page from templates/ once, with an ETag for its contents"""
+    with open(os.path.join(app.root_path, app.template_folder, name), 'rb') as f:
+        body = f.read()
+    return body, hashlib.blake2b(body, digest_size=16).hexdigest()
+
+# Neither page uses Jinja, so both are served as precomputed bytes
+HOME_HTML, HOME_ETAG = load_page('index.html')
+ADMIN_DASHBOARD_HTML, _ = load_page('admin_dashboard.html')
 
 @app.route("/")
 def home():
-    return render_template('index.html')
+    response = Response(HOME_HTML, mimetype='text/html')
+    response.set_etag(HOME_ETAG)
+    response.cache_control.public = True
+    response.cache_control.max_age = 3600
+    return response.make_conditional(request)
+
+# Built once; SQLAlchemy reuses its compiled form for every lookup
+USER_BY_NAME = select(User).where(User.username == bindparam('username'))
+
+def find_user(username):
+    """User with the given username, or None"""
+    return db.session.execute(USER_BY_NAME, {'username': username}).scalar_one_or_none()
+
+def current_user():
+    """Logged-in User for this request, loaded from the database at most once"""
+    if '_user' not in g:
+        g._user = db.session.get(User, session['user_id']) if 'user_id' in session else None
+    return g._user
 
 # --- User Authentication Endpoints ---
 @app.route('/signup', methods=['POST'])
@@ -65,12 +150,13 @@ def signup():
     data = request.json
     if not data or not data.get('username') or not data.get('password'):
         return jsonify({'error': 'Username and password required'}), 400
-    if User.query.filter_by(username=data['username']).first():
+    if find_user(data['username']):
         return jsonify({'error': 'Username already exists'}), 400
     user = User(username=data['username'])
     user.set_password(data['password'])
     db.session.add(user)
     db.session.commit()
+    _admin_cache.pop('user-stats', None)
     return jsonify({'message': 'User created'})
 
 @app.route('/admin/create', methods=['POST'])
@@ -90,7 +176,7 @@ def create_admin():
         print(f"Warning: Could not check for existing admin: {e}")
         # Continue with creation
     
-    if User.query.filter_by(username=data['username']).first():
+    if find_user(data['username']):
         return jsonify({'error': 'Username already exists'}), 400
     
     try:
@@ -98,6 +184,7 @@ def create_admin():
         user.set_password(data['password'])
         db.session.add(user)
         db.session.commit()
+        _admin_cache.pop('user-stats', None)
         return jsonify({'message': 'Admin user created successfully'})
     except Exception as e:
         # If is_admin column doesn't exist, create user without admin flag
@@ -106,6 +193,7 @@ def create_admin():
         user.set_password(data['password'])
         db.session.add(user)
         db.session.commit()
+        _admin_cache.pop('user-stats', None)
         return jsonify({'message': 'User created (admin flag not available)'})
 
 @app.route('/login', methods=['POST'])
@@ -113,8 +201,12 @@ def login():
     data = request.json
     if not data or not data.get('username') or not data.get('password'):
         return jsonify({'error': 'Username and password required'}), 400
-    user = User.query.filter_by(username=data['username']).first()
-    if user and user.check_password(data['password']):
+    user = find_user(data['username'])
+    if user:
+        valid = user.check_password(data['password'])
+    else:
+        valid = check_dummy_password(data['password'])
+    if valid:
         session['user_id'] = user.id
         session['is_admin'] = user.is_admin_user()
         return jsonify({
@@ -133,18 +225,29 @@ def logout():
 def user_data():
     if 'user_id' not in session:
         return jsonify({'error': 'Not logged in'}), 401
-    user = db.session.get(User, session['user_id'])
+    user = current_user()
     if request.method == 'POST':
         user.data = request.json.get('data', '')
         db.session.commit()
+        _admin_cache.pop('user-stats', None)
         return jsonify({'message': 'Data saved'})
     return jsonify({'data': user.data or ''})
 
 # --- Fraud Detection Endpoints ---
+# Most items one batch request may carry; each item is already capped at
+# MAX_CONTENT_LENGTH characters of scanning
+MAX_BATCH_SIZE = 100
+BATCH_TOO_LARGE = {'error': f'At most {MAX_BATCH_SIZE} items per batch'}
+
 @app.route("/analyze/email", methods=["POST"])
 def analyze_email():
     try:
         data = request.json or {}
+        # A 'contents' list is analyzed as one batch
+        if isinstance(data.get('contents'), list):
+            if len(data['contents']) > MAX_BATCH_SIZE:
+                return jsonify(BATCH_TOO_LARGE), 400
+            return jsonify({'results': ai.analyze_emails(data['contents'])})
         email_content = data.get('content', '')
         result = ai.analyze_email(email_content)
         return jsonify(result)
@@ -156,6 +259,11 @@ def analyze_email():
 def analyze_transaction():
     try:
         data = request.json or {}
+        # A 'transactions' list is analyzed as one batch
+        if isinstance(data.get('transactions'), list):
+            if len(data['transactions']) > MAX_BATCH_SIZE:
+                return jsonify(BATCH_TOO_LARGE), 400
+            return jsonify({'results': ai.analyze_transactions(data['transactions'])})
         result = ai.analyze_transaction(data)
         return jsonify(result)
     except Exception as e:
@@ -166,6 +274,11 @@ def analyze_transaction():
 def analyze_social_media():
     try:
         data = request.json or {}
+        # A 'contents' list is analyzed as one batch
+        if isinstance(data.get('contents'), list):
+            if len(data['contents']) > MAX_BATCH_SIZE:
+                return jsonify(BATCH_TOO_LARGE), 400
+            return jsonify({'results': ai.analyze_social_media_posts(data['contents'])})
         post_content = data.get('content', '')
         result = ai.analyze_social_media(post_content)
         return jsonify(result)
@@ -184,11 +297,11 @@ def admin_dashboard():
     if 'user_id' not in session:
         return jsonify({'error': 'Not logged in'}), 401
     
-    user = db.session.get(User, session['user_id'])
+    user = current_user()
     if not user or not user.is_admin_user():
         return jsonify({'error': 'Admin access required'}), 403
     
-    return render_template('admin_dashboard.html')
+    return Response(ADMIN_DASHBOARD_HTML, mimetype='text/html')
 
 @app.route("/admin/api/health")
 def admin_api_health():
@@ -196,10 +309,14 @@ def admin_api_health():
     if 'user_id' not in session:
         return jsonify({'error': 'Not logged in'}), 401
     
-    user = db.session.get(User, session['user_id'])
+    user = current_user()
     if not user or not user.is_admin_user():
         return jsonify({'error': 'Admin access required'}), 403
     
+    return jsonify(cached_admin_payload('health', 5, health_payload))
+
+def health_payload():
+    """Database and AI model status for the admin health endpoint"""
     try:
         # Check database connection
         db.session.execute('SELECT 1')
@@ -209,17 +326,17 @@ def admin_api_health():
     
     # Check AI model
     try:
-        test_result = ai.analyze_email("Test email")
+        test_result = ai.self_test()
         ai_status = "Working"
     except Exception as e:
         ai_status = f"Error: {str(e)}"
     
-    return jsonify({
+    return {
         "database": db_status,
         "ai_model": ai_status,
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": now_iso(),
         "uptime": "Running"
-    })
+    }
 
 @app.route("/admin/api/user-stats")
 def admin_user_stats():
@@ -227,33 +344,35 @@ def admin_user_stats():
     if 'user_id' not in session:
         return jsonify({'error': 'Not logged in'}), 401
     
-    user = db.session.get(User, session['user_id'])
+    user = current_user()
     if not user or not user.is_admin_user():
         return jsonify({'error': 'Admin access required'}), 403
     
     try:
-        total_users = User.query.count()
-        
-        # Get recent signups (last 7 days)
-        week_ago = datetime.now() - timedelta(days=7)
-        recent_signups = User.query.filter(User.id >= 1).count()  # Simplified for now
-        
-        # Get user activity (users with data)
-        active_users = User.query.filter(User.data.isnot(None)).count()
-        
-        # Get admin count
-        admin_count = User.query.filter_by(is_admin=True).count()
-        
-        return jsonify({
-            "total_users": total_users,
-            "recent_signups": recent_signups,
-            "active_users": active_users,
-            "admin_users": admin_count,
-            "timestamp": datetime.now().isoformat()
-        })
+        return jsonify(cached_admin_payload('user-stats', 15, user_stats_payload))
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+def user_stats_payload():
+    """User counts for the admin user-stats endpoint"""
+    # One scan of the users table for all four counts. Recent signups
+    # (last 7 days) are simplified for now: users has no created_at column.
+    stmt = select(
+        func.count(),
+        func.count(case((User.id >= 1, 1))),
+        func.count(case((User.data.isnot(None), 1))),
+        func.count(case((User.is_admin == True, 1)))
+    )
+    total_users, recent_signups, active_users, admin_count = db.session.execute(stmt).one()
+    
+    return {
+        "total_users": total_users,
+        "recent_signups": recent_signups,
+        "active_users": active_users,
+        "admin_users": admin_count,
+        "timestamp": now_iso()
+    }
+
 @app.route("/migrate/add-admin-column")
 def migrate_add_admin_column():
     """Manual migration endpoint to add is_admin column"""
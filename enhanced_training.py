@@ -6,12 +6,19 @@ Trains all fraud detection models with more diverse and realistic data
 
 import requests
 import json
-import time
+import orjson
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
 
 # API base URL
 BASE_URL = "http://localhost:5000"
 
+# One keep-alive pool for every call, sized for the concurrent trainers
+SESSION = requests.Session()
+SESSION.mount('http://', HTTPAdapter(pool_connections=8, pool_maxsize=8, max_retries=0))
+SESSION.headers['Content-Type'] = 'application/json'
+
 def create_enhanced_training_data():
     """Create comprehensive training data with more diverse examples"""
     
@@ -498,7 +505,52 @@ def create_enhanced_training_data():
         }
     }
     
-    return training_data
+    # Flatten each channel once so the trainers can send it as-is
+    return {
+        channel: {
+            'samples': data['fraudulent'] + data['legitimate'],
+            'n_fraud': len(data['fraudulent']),
+            'n_legit': len(data['legitimate'])
+        }
+        for channel, data in training_data.items()
+    }
+
+def _request_json(method, path, payload=None, timeout=30):
+    """Call an API endpoint and decode its JSON reply; raises on HTTP errors"""
+    response = SESSION.request(
+        method,
+        f"{BASE_URL}{path}",
+        data=orjson.dumps(payload) if payload is not None else None,
+        timeout=timeout
+    )
+    response.raise_for_status()
+    return orjson.loads(response.content)
+
+def _train_channel(channel, data):
+    """Train one channel's model; returns the lines to report for it"""
+    lines = [
+        f"\n📊 Training {channel.upper()} model...",
+        "-" * 40,
+        f"📈 Training samples: {len(data['samples'])}",
+        f"   - Fraudulent: {data['n_fraud']}",
+        f"   - Legitimate: {data['n_legit']}"
+    ]
+    
+    # Train the model
+    try:
+        # Training can run for a while, so wait for it without a timeout
+        result = _request_json('POST', '/api/ai/train', {
+            'channel': channel,
+            'training_data': data['samples']
+        }, timeout=None)
+        lines.append(f"✅ {channel} model trained successfully!")
+        lines.append(f"   Performance: {result.get('performance', {})}")
+    except requests.HTTPError as e:
+        lines.append(f"❌ Failed to train {channel} model: {e.response.text}")
+    except Exception as e:
+        lines.append(f"❌ Error training {channel} model: {e}")
+    
+    return lines
 
 def train_enhanced_models():
     """Train all models with enhanced comprehensive data"""
@@ -509,55 +561,25 @@ def train_enhanced_models():
     # Get training data
     training_data = create_enhanced_training_data()
     
-    # Train each channel
-    for channel, data in training_data.items():
-        print(f"\n📊 Training {channel.upper()} model...")
-        print("-" * 40)
-        
-        # Combine fraudulent and legitimate data
-        all_training_data = data['fraudulent'] + data['legitimate']
-        
-        print(f"📈 Training samples: {len(all_training_data)}")
-        print(f"   - Fraudulent: {len(data['fraudulent'])}")
-        print(f"   - Legitimate: {len(data['legitimate'])}")
-        
-        # Train the model
-        try:
-            response = requests.post(
-                f"{BASE_URL}/api/ai/train",
-                json={
-                    'channel': channel,
-                    'training_data': all_training_data
-                },
-                headers={'Content-Type': 'application/json'}
-            )
-            
-            if response.status_code == 200:
-                result = response.json()
-                print(f"✅ {channel} model trained successfully!")
-                print(f"   Performance: {result.get('performance', {})}")
-            else:
-                print(f"❌ Failed to train {channel} model: {response.text}")
-                
-        except Exception as e:
-            print(f"❌ Error training {channel} model: {e}")
-        
-        time.sleep(1)  # Brief pause between training
+    # Train every channel concurrently and report each as it finishes
+    with ThreadPoolExecutor(max_workers=len(training_data)) as executor:
+        futures = [
+            executor.submit(_train_channel, channel, data)
+            for channel, data in training_data.items()
+        ]
+        for future in as_completed(futures):
+            print("\n".join(future.result()))
     
     print("\n" + "=" * 60)
     print("💾 Saving trained models...")
     
     # Save all trained models
     try:
-        response = requests.post(f"{BASE_URL}/api/ai/save")
-        
-        if response.status_code == 200:
-            result = response.json()
-            print(f"✅ Models saved successfully!")
-            print(f"   Filepath: {result.get('filepath', 'Unknown')}")
-        else:
-            print(f"❌ Failed to save models: {response.text}")
-            
+        result = _request_json('POST', '/api/ai/save')
+        print(f"✅ Models saved successfully!")
+        print(f"   Filepath: {result.get('filepath', 'Unknown')}")
+    except requests.HTTPError as e:
+        print(f"❌ Failed to save models: {e.response.text}")
     except Exception as e:
         print(f"❌ Error saving models: {e}")
     
@@ -566,16 +588,12 @@ def train_enhanced_models():
     
     # Check final status
     try:
-        response = requests.get(f"{BASE_URL}/api/ai/status")
-        
-        if response.status_code == 200:
-            status = response.json()
-            print(f"   Active System: {status.get('active_ai_system', 'Unknown')}")
-            print(f"   Trained Models: {status.get('trained_models', [])}")
-            print(f"   Performance: {status.get('performance', {})}")
-        else:
-            print(f"❌ Failed to get status: {response.text}")
-            
+        status = _request_json('GET', '/api/ai/status')
+        print(f"   Active System: {status.get('active_ai_system', 'Unknown')}")
+        print(f"   Trained Models: {status.get('trained_models', [])}")
+        print(f"   Performance: {status.get('performance', {})}")
+    except requests.HTTPError as e:
+        print(f"❌ Failed to get status: {e.response.text}")
     except Exception as e:
         print(f"❌ Error getting status: {e}")
     
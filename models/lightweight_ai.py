@@ -9,62 +9,185 @@ from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.ensemble import RandomForestClassifier
 import pickle
 import os
+import hashlib
+import threading
+import logging
+from bisect import bisect_right
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+# Number of recently seen texts whose features are kept in memory
+FEATURE_CACHE_SIZE = 4096
+
+# Longest prefix of a request's text that feature extraction will scan
+MAX_CONTENT_LENGTH = 65536
+
+# Suspicious patterns; each one becomes a 'pattern_<first word>' feature
+SUSPICIOUS_PATTERNS = [
+    r'urgent|emergency|immediate|asap',
+    r'bank|account|password|login|verify',
+    r'lottery|winner|prize|claim|money',
+    r'bitcoin|crypto|wallet|investment',
+    r'click|link|website|url',
+    r'limited|offer|expire|soon',
+    r'free|gift|bonus|reward',
+    r'personal|information|social|security',
+    r'payment|credit|card|banking',
+    r'verify|confirm|update|secure'
+]
+SUSPICIOUS_FEATURES = [f'pattern_{pattern.split("|")[0]}' for pattern in SUSPICIOUS_PATTERNS]
+
+# keyword -> features it counts towards ('verify' feeds two patterns)
+KEYWORD_FEATURES = {}
+for _name, _pattern in zip(SUSPICIOUS_FEATURES, SUSPICIOUS_PATTERNS):
+    for _keyword in _pattern.split('|'):
+        KEYWORD_FEATURES.setdefault(_keyword, []).append(_name)
+
+# keyword -> every keyword that is a prefix of it ('banking' also starts 'bank')
+KEYWORD_PREFIXES = {
+    keyword: [other for other in KEYWORD_FEATURES if keyword.startswith(other)]
+    for keyword in KEYWORD_FEATURES
+}
+
+# All keywords fused into one longest-first alternation. The lookahead makes
+# every match zero-width, so overlapping keywords from different patterns are
+# still seen and the text is scanned once instead of once per pattern.
+SUSPICIOUS_RE = re.compile(
+    '(?=(' + '|'.join(sorted(KEYWORD_FEATURES, key=len, reverse=True)) + '))'
+)
+
+# Risk weight per suspicious-pattern match
+PATTERN_WEIGHTS = {
+    'pattern_urgent': 20,
+    'pattern_bank': 25,
+    'pattern_lottery': 30,
+    'pattern_bitcoin': 25,
+    'pattern_click': 15,
+    'pattern_limited': 10,
+    'pattern_free': 15,
+    'pattern_personal': 20,
+    'pattern_payment': 25,
+    'pattern_verify': 20
+}
+PATTERN_WEIGHT_VECTOR = np.array(list(PATTERN_WEIGHTS.values()), dtype=np.float64)
+
+# Risk level tables per channel: score thresholds in ascending order, and the
+# (risk_level, recommendation) for each band they delimit
+EMAIL_RISK_LEVELS = ((40, 70), (
+    ("LOW", "Appears safe - minimal risk indicators"),
+    ("MEDIUM", "Review carefully - suspicious patterns detected"),
+    ("HIGH", "Block immediately - multiple fraud indicators detected")
+))
+TRANSACTION_RISK_LEVELS = ((30, 60), (
+    ("LOW", "Transaction appears normal"),
+    ("MEDIUM", "Monitor transaction - some risk factors"),
+    ("HIGH", "Review transaction - multiple risk factors")
+))
+SOCIAL_MEDIA_RISK_LEVELS = ((35, 65), (
+    ("LOW", "Normal social media activity"),
+    ("MEDIUM", "Monitor account - some suspicious indicators"),
+    ("HIGH", "Flag for review - suspicious social media activity")
+))
+
+# Sentiment wordlists, each matched in one pass. The lookahead keeps matches
+# zero-width so words that overlap in the text are all still found.
+POSITIVE_WORDS = frozenset({'good', 'great', 'excellent', 'amazing', 'wonderful', 'perfect'})
+NEGATIVE_WORDS = frozenset({'bad', 'terrible', 'awful', 'horrible', 'disaster', 'problem'})
+POSITIVE_RE = re.compile('(?=(' + '|'.join(sorted(POSITIVE_WORDS)) + '))')
+NEGATIVE_RE = re.compile('(?=(' + '|'.join(sorted(NEGATIVE_WORDS)) + '))')
+
+EMAIL_RE = re.compile(r'\S+@\S+')
+# One character class instead of an alternation of overlapping classes, so the
+# repeat never has alternatives to backtrack through on hostile input
+URL_RE = re.compile(r'http[s]?://[a-zA-Z0-9$-_@.&+!*\\(),]+')
+
+def count_suspicious_patterns(text_lower):
+    """Count non-overlapping matches of each suspicious pattern in one pass"""
+    counts = dict.fromkeys(SUSPICIOUS_FEATURES, 0)
+    next_free = dict.fromkeys(SUSPICIOUS_FEATURES, 0)
+    for match in SUSPICIOUS_RE.finditer(text_lower):
+        start = match.start()
+        for keyword in KEYWORD_PREFIXES[match.group(1)]:
+            for name in KEYWORD_FEATURES[keyword]:
+                # Mirror re.findall: skip matches overlapping the previous one
+                if start >= next_free[name]:
+                    counts[name] += 1
+                    next_free[name] = start + len(keyword)
+    return counts
+
+def risk_level_for(risk_score, risk_levels):
+    """Look up (risk_level, recommendation) for a score in a risk level table"""
+    thresholds, levels = risk_levels
+    return levels[bisect_right(thresholds, risk_score)]
 
 class LightweightAI:
     def __init__(self):
         self.vectorizer = TfidfVectorizer(max_features=1000, stop_words='english')
         self.classifier = RandomForestClassifier(n_estimators=50, random_state=42)
         self.is_trained = False
+        # LRU of extracted features, keyed by a digest of the text so the
+        # cache never holds on to the request bodies themselves
+        self._feature_cache = OrderedDict()
+        self._feature_cache_lock = threading.Lock()
+        self._self_test_result = None
         
+    def self_test(self):
+        """Analyze a fixed sample email once and reuse the result afterwards"""
+        if self._self_test_result is None:
+            self._self_test_result = self.analyze_email("Test email")
+        return self._self_test_result
+    
     def extract_features(self, text):
-        """Extract basic text features without heavy ML models"""
+        """Extract basic text features, reusing results for repeated texts"""
         if not text:
             return {}
         
+        key = hashlib.blake2b(text.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+        with self._feature_cache_lock:
+            features = self._feature_cache.get(key)
+            if features is not None:
+                self._feature_cache.move_to_end(key)
+                return dict(features)
+        
+        features = self._compute_features(text)
+        with self._feature_cache_lock:
+            self._feature_cache[key] = features
+            if len(self._feature_cache) > FEATURE_CACHE_SIZE:
+                self._feature_cache.popitem(last=False)
+        return dict(features)
+    
+    def _compute_features(self, text):
+        """Extract basic text features without heavy ML models"""
         features = {}
         
         # Basic text statistics
         features['length'] = len(text)
+        
+        # Only the first MAX_CONTENT_LENGTH characters are scanned, so a huge
+        # payload cannot make every pattern pass walk megabytes of text
+        text = text[:MAX_CONTENT_LENGTH]
         features['word_count'] = len(text.split())
-        features['char_count'] = len(text.replace(' ', ''))
+        features['char_count'] = len(text) - text.count(' ')
         
         # Suspicious patterns
-        suspicious_patterns = [
-            r'urgent|emergency|immediate|asap',
-            r'bank|account|password|login|verify',
-            r'lottery|winner|prize|claim|money',
-            r'bitcoin|crypto|wallet|investment',
-            r'click|link|website|url',
-            r'limited|offer|expire|soon',
-            r'free|gift|bonus|reward',
-            r'personal|information|social|security',
-            r'payment|credit|card|banking',
-            r'verify|confirm|update|secure'
-        ]
-        
         text_lower = text.lower()
-        for pattern in suspicious_patterns:
-            matches = len(re.findall(pattern, text_lower))
-            features[f'pattern_{pattern.split("|")[0]}'] = matches
+        features.update(count_suspicious_patterns(text_lower))
         
         # Email-specific features
         if '@' in text:
             features['has_email'] = 1
-            features['email_count'] = len(re.findall(r'\S+@\S+', text))
+            features['email_count'] = len(EMAIL_RE.findall(text))
         else:
             features['has_email'] = 0
             features['email_count'] = 0
         
         # URL features
-        url_pattern = r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+'
-        features['url_count'] = len(re.findall(url_pattern, text))
-        
-        # Sentiment indicators
-        positive_words = ['good', 'great', 'excellent', 'amazing', 'wonderful', 'perfect']
-        negative_words = ['bad', 'terrible', 'awful', 'horrible', 'disaster', 'problem']
+        features['url_count'] = len(URL_RE.findall(text))
         
-        features['positive_words'] = sum(1 for word in positive_words if word in text_lower)
-        features['negative_words'] = sum(1 for word in negative_words if word in text_lower)
+        # Sentiment indicators (number of distinct words present)
+        features['positive_words'] = len(set(POSITIVE_RE.findall(text_lower)))
+        features['negative_words'] = len(set(NEGATIVE_RE.findall(text_lower)))
         
         return features
     
@@ -79,20 +202,7 @@ class LightweightAI:
             risk_score += 15
         
         # Pattern-based risk
-        pattern_weights = {
-            'pattern_urgent': 20,
-            'pattern_bank': 25,
-            'pattern_lottery': 30,
-            'pattern_bitcoin': 25,
-            'pattern_click': 15,
-            'pattern_limited': 10,
-            'pattern_free': 15,
-            'pattern_personal': 20,
-            'pattern_payment': 25,
-            'pattern_verify': 20
-        }
-        
-        for pattern, weight in pattern_weights.items():
+        for pattern, weight in PATTERN_WEIGHTS.items():
             if features.get(pattern, 0) > 0:
                 risk_score += weight * features[pattern]
         
@@ -111,10 +221,40 @@ class LightweightAI:
         
         return risk_score
     
+    def calculate_risk_scores(self, features_list):
+        """Vectorized calculate_risk_score for a batch of feature dicts"""
+        columns = ['length', 'email_count', 'url_count', 'positive_words', 'negative_words']
+        columns += list(PATTERN_WEIGHTS)
+        X = np.array(
+            [[features.get(key, 0) for key in columns] for features in features_list],
+            dtype=np.float64
+        ).reshape(len(features_list), len(columns))
+        length, email_count, url_count, positive, negative = X[:, :5].T
+        
+        risk_scores = X[:, 5:] @ PATTERN_WEIGHT_VECTOR
+        risk_scores += np.where(length > 1000, 10, np.where(length < 50, 15, 0))
+        risk_scores += np.where(email_count > 2, 20, 0)
+        risk_scores += np.where(url_count > 3, 25, 0)
+        risk_scores += np.where(negative > positive, 10, 0)
+        
+        return np.clip(risk_scores, 0, 100)
+    
     def analyze_email(self, email_content):
         """Analyze email for fraud indicators"""
         features = self.extract_features(email_content)
-        risk_score = self.calculate_risk_score(features)
+        return self._email_analysis(features, self.calculate_risk_score(features))
+    
+    def analyze_emails(self, email_contents):
+        """Analyze a batch of emails, scoring them in one vectorized pass"""
+        features_list = [self.extract_features(content) for content in email_contents]
+        risk_scores = self.calculate_risk_scores(features_list)
+        return [
+            self._email_analysis(features, risk_score)
+            for features, risk_score in zip(features_list, risk_scores)
+        ]
+    
+    def _email_analysis(self, features, risk_score):
+        """Build the email analysis result from features and base risk score"""
         # Ensure risk_score is always a float and not NaN
         try:
             risk_score = float(risk_score)
@@ -122,17 +262,9 @@ class LightweightAI:
                 risk_score = 0.0
         except Exception:
             risk_score = 0.0
-        print(f"[DEBUG] Email risk_score: {risk_score}")
+        logger.debug("Email risk_score: %s", risk_score)
         # Determine risk level
-        if risk_score >= 70:
-            risk_level = "HIGH"
-            recommendation = "Block immediately - multiple fraud indicators detected"
-        elif risk_score >= 40:
-            risk_level = "MEDIUM"
-            recommendation = "Review carefully - suspicious patterns detected"
-        else:
-            risk_level = "LOW"
-            recommendation = "Appears safe - minimal risk indicators"
+        risk_level, recommendation = risk_level_for(risk_score, EMAIL_RISK_LEVELS)
         # Generate detailed analysis
         analysis = {
             'risk_score': risk_score,
@@ -152,7 +284,7 @@ class LightweightAI:
             analysis['indicators'].append("Multiple email addresses detected")
         if features.get('url_count', 0) > 3:
             analysis['indicators'].append("Suspicious number of URLs")
-        print(f"[DEBUG] Email analysis result: {analysis}")
+        logger.debug("Email analysis result: %s", analysis)
         return analysis
     
     def analyze_transaction(self, transaction_data):
@@ -193,15 +325,7 @@ class LightweightAI:
         risk_score = min(100, max(0, risk_score))
         
         # Determine risk level
-        if risk_score >= 60:
-            risk_level = "HIGH"
-            recommendation = "Review transaction - multiple risk factors"
-        elif risk_score >= 30:
-            risk_level = "MEDIUM"
-            recommendation = "Monitor transaction - some risk factors"
-        else:
-            risk_level = "LOW"
-            recommendation = "Transaction appears normal"
+        risk_level, recommendation = risk_level_for(risk_score, TRANSACTION_RISK_LEVELS)
         
         return {
             'risk_score': risk_score,
@@ -213,11 +337,26 @@ class LightweightAI:
             'merchant': merchant
         }
     
+    def analyze_transactions(self, transactions):
+        """Analyze a batch of transactions"""
+        return [self.analyze_transaction(transaction) for transaction in transactions]
+    
     def analyze_social_media(self, post_content):
         """Analyze social media post for fraud indicators"""
         features = self.extract_features(post_content)
-        risk_score = self.calculate_risk_score(features)
-        
+        return self._social_media_analysis(features, self.calculate_risk_score(features))
+    
+    def analyze_social_media_posts(self, post_contents):
+        """Analyze a batch of social media posts, scoring them in one vectorized pass"""
+        features_list = [self.extract_features(content) for content in post_contents]
+        risk_scores = self.calculate_risk_scores(features_list)
+        return [
+            self._social_media_analysis(features, int(risk_score))
+            for features, risk_score in zip(features_list, risk_scores)
+        ]
+    
+    def _social_media_analysis(self, features, risk_score):
+        """Build the social media analysis result from features and base risk score"""
         # Social media specific adjustments
         if features.get('url_count', 0) > 2:
             risk_score += 10
@@ -229,15 +368,7 @@ class LightweightAI:
         risk_score = min(100, max(0, risk_score))
         
         # Determine risk level
-        if risk_score >= 65:
-            risk_level = "HIGH"
-            recommendation = "Flag for review - suspicious social media activity"
-        elif risk_score >= 35:
-            risk_level = "MEDIUM"
-            recommendation = "Monitor account - some suspicious indicators"
-        else:
-            risk_level = "LOW"
-            recommendation = "Normal social media activity"
+        risk_level, recommendation = risk_level_for(risk_score, SOCIAL_MEDIA_RISK_LEVELS)
         
         return {
             'risk_score': risk_score,
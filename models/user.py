@@ -3,6 +3,14 @@ from werkzeug.security import generate_password_hash, check_password_hash
 
 db = SQLAlchemy()
 
+# Hash checked when a login names no existing user, so that path does the
+# same hashing work as a real password check
+DUMMY_PASSWORD_HASH = generate_password_hash('dummy-password')
+
+def check_dummy_password(password):
+    check_password_hash(DUMMY_PASSWORD_HASH, password)
+    return False
+
 class User(db.Model):
     __tablename__ = "users"
     id = db.Column(db.Integer, primary_key=True)